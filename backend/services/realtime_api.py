@@ -10,10 +10,10 @@ import json
 import logging
 from typing import Dict, List, Any, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
-from .realtime_simulation_service import get_simulation_service
+from .realtime_simulation_service import get_simulation_service, message_encoder, websocket_message, WEBSOCKET_SUBPROTOCOLS
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -21,6 +21,9 @@ logger = logging.getLogger(__name__)
 # Create API router
 router = APIRouter(prefix="/api/realtime", tags=["Real-time Simulation"])
 
+# Encoder for JSON response bodies built straight from result dataclasses
+encode_json = message_encoder()
+
 # Pydantic models for request/response
 class SimulationControlRequest(BaseModel):
     """Request model for simulation control"""
@@ -52,25 +55,32 @@ simulation_task = None
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time classification results"""
-    await websocket.accept()
+    # Clients offering a supported subprotocol (e.g. "msgpack") get binary frames, everyone else JSON text
+    offered = websocket.scope.get("subprotocols", [])
+    subprotocol = next((name for name in offered if name in WEBSOCKET_SUBPROTOCOLS), None)
+    await websocket.accept(subprotocol=subprotocol)
     
     service = get_simulation_service()
-    service.add_websocket_connection(websocket)
+    service.add_websocket_connection(websocket, subprotocol)
+    
+    async def send_message(message: Dict[str, Any]):
+        # Same framing as the classification broadcast, so one socket never mixes text and binary frames
+        await websocket.send(websocket_message(message, subprotocol))
     
     try:
         # Send initial status
         status = service.get_simulation_status()
-        await websocket.send_text(json.dumps({
+        await send_message({
             "type": "status",
             "data": status
-        }))
+        })
         
         # Send recent classifications
         recent = service.get_recent_classifications(limit=50)
-        await websocket.send_text(json.dumps({
+        await send_message({
             "type": "initial_data",
             "data": recent
-        }))
+        })
         
         # Keep connection alive and handle incoming messages
         while True:
@@ -82,22 +92,22 @@ async def websocket_endpoint(websocket: WebSocket):
                 # Handle client requests
                 if data.get("type") == "get_status":
                     status = service.get_simulation_status()
-                    await websocket.send_text(json.dumps({
+                    await send_message({
                         "type": "status",
                         "data": status
-                    }))
+                    })
                 elif data.get("type") == "get_network_graph":
                     graph_data = service.get_network_graph_data()
-                    await websocket.send_text(json.dumps({
+                    await send_message({
                         "type": "network_graph",
                         "data": graph_data
-                    }))
+                    })
                 elif data.get("type") == "get_timeline":
                     timeline = service.get_attack_timeline(minutes=60)
-                    await websocket.send_text(json.dumps({
+                    await send_message({
                         "type": "attack_timeline",
                         "data": timeline
-                    }))
+                    })
                     
             except WebSocketDisconnect:
                 break
@@ -251,12 +261,13 @@ async def get_recent_classifications(limit: int = 100):
     """Get recent classification results"""
     service = get_simulation_service()
     try:
-        recent = service.get_recent_classifications(limit=limit)
-        return {
+        # Encode the dataclasses directly instead of converting them and letting FastAPI re-walk the dicts
+        recent = service.get_recent_results(limit=limit)
+        return Response(content=encode_json({
             "status": "success",
             "data": recent,
             "count": len(recent)
-        }
+        }), media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting recent classifications: {e}")
         raise HTTPException(status_code=500, detail=str(e))
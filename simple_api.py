@@ -1568,10 +1568,11 @@ if __name__ == "__main__":
     event_thread = threading.Thread(target=generate_realtime_events, daemon=True)
     event_thread.start()
     
-    # Start the API server
+    # Start the API server; broadcasts are encoded once and shared, so skip per-client WebSocket compression
     uvicorn.run(
         app, 
         host="0.0.0.0", 
         port=8000,
-        log_level="info"
+        log_level="info",
+        ws_per_message_deflate=False
     )